@@ -1,36 +1,174 @@
+import asyncio
 import json
+import logging
+import mmap
+import os
+import re
 import sys
-from threading import Lock
-from fastapi import FastAPI, HTTPException, Depends, Request, Response
-from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional
+from contextlib import asynccontextmanager
+import aiofiles
+import aiofiles.os
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, field_validator
+from typing import List, NamedTuple, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+class RWLock:
+    """Reader/writer lock for coroutines
+
+    Any number of readers may hold the lock at the same time, a writer holds it
+    alone.  Waiting writers keep new readers out so they are not starved.
+    """
+    def __init__(self):
+        self._cond = asyncio.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+
+    @asynccontextmanager
+    async def reader(self):
+        """Hold the lock shared with other readers"""
+        async with self._cond:
+            await self._cond.wait_for(lambda: not self._writing and not self._writers_waiting)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @asynccontextmanager
+    async def writer(self):
+        """Hold the lock exclusively"""
+        async with self._cond:
+            self._writers_waiting += 1
+            try:
+                await self._cond.wait_for(lambda: not self._writing and not self._readers)
+            finally:
+                self._writers_waiting -= 1
+                # Wake readers held back by this writer if it gave up waiting
+                self._cond.notify_all()
+            self._writing = True
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the platforms snapshot and replay the log into the in-memory index once at startup"""
+    global lock
+    # Created here rather than at import so that on Python 3.9 it binds to the serving loop
+    lock = RWLock()
+    store_lock = _lock_store()
+    try:
+        async with lock.writer():
+            _index_platforms(await _load_platforms())
+            await _replay_log()
+        _state["pending"], _state["closing"] = [], False
+        _state["dirty"] = asyncio.Event()
+        flusher = asyncio.create_task(_flusher())
+        try:
+            yield
+        finally:
+            # Let the flusher write whatever is still pending and exit
+            _state["closing"] = True
+            _state["dirty"].set()
+            await flusher
+    finally:
+        store_lock.close()
 
 app = FastAPI(
     title="Platform Management API",
     description="API for managing platform registrations",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 platform_file = "platforms.json"
-lock = Lock()
+platform_log = "platforms.log"
+store_lock_file = "platforms.lock"
+# RWLock guarding _state, created by lifespan on the event loop that serves requests
+lock = None
 DEFAULT_GROUP = "default"
-
-class PlatformWithIP(BaseModel):
-    """Internal model for storing platform data with IP tracking"""
+_SCHEMES = ('http://', 'https://', 'tcp://', 'ipc://')
+_IP_RE = re.compile(r'^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}(:\d+)?$')
+
+# The log is compacted into a new snapshot once it is larger than both
+# COMPACT_RATIO times the snapshot and COMPACT_MIN_SIZE bytes.
+COMPACT_RATIO = 4
+COMPACT_MIN_SIZE = 64 * 1024
+
+# Seconds to collect log entries before writing them out with a single fsync.
+# Mutations are acknowledged before they reach disk, so a crash can lose up to
+# this much of the most recent history.
+FLUSH_INTERVAL = 0.1
+
+# GET /platforms caches its body while there are at most STREAM_THRESHOLD platforms.
+# Larger lists are streamed STREAM_BATCH_SIZE platforms per chunk without being cached,
+# so the response buffer never holds more than one batch.
+STREAM_THRESHOLD = 10000
+STREAM_BATCH_SIZE = 256
+
+# In-memory index of registered platforms.  platform_file holds a snapshot and
+# platform_log the mutations made since; both are only read at startup.
+#   by_id:         platform id -> PlatformWithIP
+#   by_addr:       address -> platform id
+#   by_cred:       public credentials -> platform id
+#   snapshot_size: size in bytes of platform_file
+#   log_size:      size in bytes of platform_log up to the last complete write
+#   log_torn:      True while platform_log may hold part of a failed write past log_size
+#   pending:       log lines waiting to be written by the flusher
+#   dirty:         asyncio.Event set when pending has entries
+#   closing:       True once shutdown has started
+#   list_bytes:    cached JSON body for GET /platforms, None when stale
+_state = {"by_id": {}, "by_addr": {}, "by_cred": {}, "snapshot_size": 0, "log_size": 0, "log_torn": False,
+          "pending": [], "dirty": None, "closing": False,
+          "list_bytes": None}
+
+class PlatformWithIP(NamedTuple):
+    """Internal record for storing platform data with IP tracking
+
+    A NamedTuple rather than a BaseModel: records are immutable and carry no
+    per-instance __dict__, which keeps the in-memory index compact.
+    """
     id: str
     address: str
     public_credentials: str
     group: str
     last_modified_ip: Optional[str] = None
 
-    def to_platform(self) -> "Platform":
-        """Convert to Platform model (excluding last_modified_ip)"""
-        return Platform(
-            id=self.id,
-            address=self.address,
-            public_credentials=self.public_credentials,
-            group=self.group
-        )
+    def to_dict(self, include_ip: bool = True) -> dict:
+        """Convert to a plain dict for JSON serialization
+
+        All fields are plain strings, so this bypasses model_dump entirely.  With
+        include_ip=False the result matches the Platform model.
+        """
+        data = {
+            "id": self.id,
+            "address": self.address,
+            "public_credentials": self.public_credentials,
+            "group": self.group
+        }
+        if include_ip:
+            data["last_modified_ip"] = self.last_modified_ip
+        return data
 
 class Platform(BaseModel):
     id: str = Field(...,
@@ -70,10 +208,8 @@ class Platform(BaseModel):
     def address_must_be_valid(cls, v):
         """Validate that address has a valid format"""
         # Simple URL or IP check - you might want to use proper validation libraries
-        import re
         # Basic check for IP or URL-like string
-        if not (v.startswith(('http://', 'https://', 'tcp://', 'ipc://')) or
-                re.match(r'^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}(:\d+)?$', v)):
+        if not (v.startswith(_SCHEMES) or _IP_RE.match(v)):
             raise ValueError("Address must be a valid URL, IP address, or protocol URI")
         return v
 
@@ -98,27 +234,321 @@ class Platform(BaseModel):
         }
     }
 
-def get_platforms():
-    """Dependency to get platforms with thread safety"""
-    with lock:
-        return _load_platforms()
+_platform_list = TypeAdapter(List[Platform])
+# Request body schema for POST /platforms/bulk, which reads the raw body.  Platform is
+# already in the OpenAPI components as a response model, so refer to it there.
+_platform_list_schema = {k: v for k, v in _platform_list.json_schema(ref_template="#/components/schemas/{model}").items()
+                         if k != "$defs"}
+
+def _index_platforms(platforms):
+    """Rebuild the in-memory index from a list of platforms in a single pass"""
+    by_id, by_addr, by_cred = {}, {}, {}
+    for p in platforms:
+        by_id[p.id] = p
+        by_addr[p.address] = p.id
+        by_cred[p.public_credentials] = p.id
+    _state["by_id"], _state["by_addr"], _state["by_cred"] = by_id, by_addr, by_cred
+    _invalidate()
+
+def _invalidate():
+    """Drop cached responses after a change to the in-memory index"""
+    _state["list_bytes"] = None
+
+def _put_platform(platform):
+    """Insert or replace a platform in the in-memory index"""
+    _remove_platform(platform.id)
+    _state["by_id"][platform.id] = platform
+    _state["by_addr"][platform.address] = platform.id
+    _state["by_cred"][platform.public_credentials] = platform.id
+    _invalidate()
+
+def _remove_platform(platform_id):
+    """Remove a platform from the in-memory index, returning it or None if not present"""
+    platform = _state["by_id"].pop(platform_id, None)
+    if platform is not None:
+        # Only drop mappings that still belong to this platform; while the log is
+        # replayed another platform may already have taken the address or credential
+        if _state["by_addr"].get(platform.address) == platform_id:
+            del _state["by_addr"][platform.address]
+        if _state["by_cred"].get(platform.public_credentials) == platform_id:
+            del _state["by_cred"][platform.public_credentials]
+        _invalidate()
+    return platform
+
+def _check_conflicts(platform):
+    """Raise a 400 if another platform already uses this address or public credential"""
+    if _state["by_addr"].get(platform.address, platform.id) != platform.id:
+        raise HTTPException(status_code=400, detail=f"Platform with address '{platform.address}' already exists")
 
-def _store_platforms(platforms):
-    """Save platforms to file with proper JSON serialization"""
+    if _state["by_cred"].get(platform.public_credentials, platform.id) != platform.id:
+        raise HTTPException(status_code=400, detail=f"Platform with public credential '{platform.public_credentials}' already exists")
+
+def _register(platform, client_ip):
+    """Add or update a platform in the in-memory index
+
+    Returns the stored record and the log operation for it, "add" or "update", or
+    None when the same IP resubmitted identical data and nothing changed.  Raises
+    HTTPException if the address or public credential is taken.
+
+    Callers must hold lock as a writer and append the record to the log.
+    """
+    existing_platform = _state["by_id"].get(platform.id)
+
+    # Check if this is the same request from the same IP
+    if (existing_platform is not None and
+        existing_platform.last_modified_ip == client_ip and
+        existing_platform.address == platform.address and
+        existing_platform.public_credentials == platform.public_credentials and
+        existing_platform.group == platform.group):
+        return existing_platform, None
+
+    # Check for duplicate address or credentials with other platforms
+    _check_conflicts(platform)
+
+    # Create new platform or update existing platform
+    new_platform = PlatformWithIP(
+        id=platform.id,
+        address=platform.address,
+        public_credentials=platform.public_credentials,
+        group=platform.group,
+        last_modified_ip=client_ip
+    )
+    _put_platform(new_platform)
+    return new_platform, "add" if existing_platform is None else "update"
+
+def _json_dumps(obj, indent=True):
+    """Serialize to JSON bytes, indented unless indent is False, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+def _json_loads(data):
+    """Deserialize JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+async def _store_platforms(platforms):
+    """Save platforms to file with proper JSON serialization
+
+    The data is written to a temporary file, synced to disk and then renamed over
+    platform_file, so a crash mid-write never leaves a truncated file behind.  The
+    directory is synced as well, so once this returns the rename itself is durable
+    and platform_log can safely be truncated.
+
+    Only the flusher calls this, through _compact.
+    """
     # Convert to dict for JSON serialization
-    platforms_json = [p.dict() for p in platforms]
-    with lock:
-        with open(platform_file, "w") as f:
-            json.dump(platforms_json, f, indent=2)
+    platforms_json = [p.to_dict() for p in platforms]
+    tmp_file = platform_file + ".tmp"
+    async with aiofiles.open(tmp_file, "wb") as f:
+        data = _json_dumps(platforms_json)
+        await f.write(data)
+        await f.flush()
+        await asyncio.to_thread(os.fsync, f.fileno())
+    await aiofiles.os.replace(tmp_file, platform_file)
+    await asyncio.to_thread(_fsync_dir, platform_file)
+    _state["snapshot_size"] = len(data)
+
+def _fsync_dir(path):
+    """Sync the directory containing path so renames into it survive a crash
+
+    Windows cannot open a directory for syncing, so this does nothing there.
+    """
+    if os.name == "nt":
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _lock_store():
+    """Take an exclusive lock on the platform files, returning the open lock file
+
+    The index lives in process memory, so a second process using the same files
+    would serve a diverging copy and interleave its writes to platform_log.  It is
+    refused at startup instead.  The lock is advisory and only taken where fcntl
+    is available.
+    """
+    f = open(store_lock_file, "a")
+    if fcntl is not None:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            raise RuntimeError(f"Platform files in {os.getcwd()} are in use by another process")
+    return f
+
+def _read_snapshot():
+    """Parse platform_file from a read-only memory map, returning the data and the file size
 
-def _load_platforms():
+    The kernel only pages in what the parser touches and orjson reads the mapping
+    without copying it into a bytes object first.
+    """
+    with open(platform_file, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return [], 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            if orjson is not None:
+                with memoryview(mm) as view:
+                    return orjson.loads(view), size
+            return json.loads(mm[:]), size
+
+async def _load_platforms():
     """Load platforms from file with proper deserialization"""
     try:
-        with open(platform_file, "r") as f:
-            platforms_data = json.load(f)
-            return [PlatformWithIP(**p) for p in platforms_data]
+        platforms_data, _state["snapshot_size"] = await asyncio.to_thread(_read_snapshot)
     except FileNotFoundError:
+        _state["snapshot_size"] = 0
         return []
+    # The file is only written from validated platforms, so no re-validation is needed
+    return [PlatformWithIP(**p) for p in platforms_data]
+
+def _append_log(op, platform):
+    """Queue a mutation for platform_log and wake the flusher
+
+    op is "add", "update" or "delete".  Delete entries only record the platform id.
+
+    Callers must hold lock as a writer.
+    """
+    record = {"id": platform.id} if op == "delete" else platform.to_dict()
+    _state["pending"].append(_json_dumps({"op": op, "platform": record}, indent=False) + b"\n")
+    _state["dirty"].set()
+
+async def _flusher():
+    """Write queued log entries in batches until shutdown
+
+    Entries queued within FLUSH_INTERVAL of each other share one write and fsync.
+    A failed flush is logged and retried on the next interval, so the flusher
+    keeps running for as long as the service does.
+    """
+    dirty = _state["dirty"]
+    while True:
+        # Shutdown sets dirty too, so whatever is pending then gets one last flush
+        await dirty.wait()
+        if not _state["closing"]:
+            await asyncio.sleep(FLUSH_INTERVAL)
+        dirty.clear()
+        try:
+            await _flush_log()
+        except Exception:
+            logging.getLogger(__name__).exception("Failed to write %s, retrying", platform_log)
+            if not _state["closing"]:
+                dirty.set()
+        if _state["closing"]:
+            return
+
+async def _flush_log():
+    """Append queued entries to platform_log, compacting it when it has grown too large
+
+    Only the flusher calls this, so it is the single writer of the platform files.
+    """
+    lines, _state["pending"] = _state["pending"], []
+    if lines:
+        await _write_log(lines)
+
+    if _state["log_size"] > max(COMPACT_RATIO * _state["snapshot_size"], COMPACT_MIN_SIZE):
+        await _compact()
+
+async def _write_log(lines):
+    """Append lines to platform_log and sync them to disk
+
+    If the write fails, the lines are put back at the front of the queue and
+    whatever part of them reached the file is cut off again.  A retry therefore
+    never leaves a garbled line in the middle of the log.
+    """
+    data = b"".join(lines)
+    try:
+        if _state["log_torn"]:
+            await _repair_log()
+        async with aiofiles.open(platform_log, "ab") as f:
+            await f.write(data)
+            await f.flush()
+            await asyncio.to_thread(os.fsync, f.fileno())
+    except Exception:
+        _state["pending"][:0] = lines
+        _state["log_torn"] = True
+        # If this fails too it is retried before the next write
+        await _repair_log()
+        raise
+    _state["log_size"] += len(data)
+
+async def _repair_log():
+    """Truncate platform_log back to the end of its last complete write"""
+    await asyncio.to_thread(_truncate_log, _state["log_size"])
+    _state["log_torn"] = False
+
+def _truncate_log(size):
+    """Cut platform_log to size bytes and sync it, creating it if it is missing"""
+    fd = os.open(platform_log, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        os.ftruncate(fd, size)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+async def _replay_log():
+    """Apply the entries in platform_log to the in-memory index
+
+    Entries set the absolute state of a platform, so replaying entries that are
+    already part of the snapshot is harmless.  A partially written last line left
+    by a crash is discarded.
+
+    Callers must hold lock as a writer.
+    """
+    try:
+        async with aiofiles.open(platform_log, "rb") as f:
+            data = await f.read()
+    except FileNotFoundError:
+        _state["log_size"] = 0
+        return
+
+    if data and not data.endswith(b"\n"):
+        # Drop the partial line so new entries start on a fresh line
+        data = data[:data.rfind(b"\n") + 1]
+        await asyncio.to_thread(os.truncate, platform_log, len(data))
+    _state["log_size"] = len(data)
+
+    for line in data.splitlines():
+        entry = _json_loads(line)
+        if entry["op"] == "delete":
+            _remove_platform(entry["platform"]["id"])
+        else:
+            _put_platform(PlatformWithIP(**entry["platform"]))
+
+async def _compact():
+    """Write the in-memory index to a new snapshot and truncate platform_log
+
+    The index is copied and the queued entries drained in one step under the lock.
+    Those entries are written to the old log before the snapshot, so the snapshot
+    is never ahead of the log: if the process dies before the log is truncated,
+    replaying the log over the new snapshot reproduces that snapshot.  The records
+    are immutable and the flusher is the only writer of the platform files, so
+    serializing and writing happen without holding up requests.
+    """
+    async with lock.reader():
+        platforms = list(_state["by_id"].values())
+        lines, _state["pending"] = _state["pending"], []
+    if lines:
+        await _write_log(lines)
+    await _store_platforms(platforms)
+    await asyncio.to_thread(_truncate_log, 0)
+    _state["log_size"] = 0
+
+def _json_response(data, status_code=200):
+    """Return data as pre-serialized JSON
+
+    FastAPI passes Response objects through untouched, so the route's
+    response_model only documents the body and is not used to revalidate it.
+    """
+    return Response(content=_json_dumps(data, indent=False), status_code=status_code,
+                    media_type="application/json")
 
 def _get_client_ip(request: Request) -> str:
     """Extract client IP address from request"""
@@ -141,7 +571,7 @@ async def root():
     return {"message": app.title, "version": app.version}
 
 @app.post("/platform", response_model=Platform, tags=["Platforms"])
-async def register_platform(platform: Platform, request: Request, response: Response):
+async def register_platform(platform: Platform, request: Request):
     """
     Register a new platform
 
@@ -156,75 +586,83 @@ async def register_platform(platform: Platform, request: Request, response: Resp
     - 200: If the same IP submits identical platform data
     - 201: If new platform is created or existing platform is updated
     """
-    platforms = get_platforms()
     client_ip = _get_client_ip(request)
 
-    # Check if platform already exists
-    for i, existing_platform in enumerate(platforms):
-        if existing_platform.id == platform.id:
-            # Check if this is the same request from the same IP
-            if (existing_platform.last_modified_ip == client_ip and
-                existing_platform.address == platform.address and
-                existing_platform.public_credentials == platform.public_credentials and
-                existing_platform.group == platform.group):
-                # Same data from same IP - return 200
-                response.status_code = 200
-                return existing_platform.to_platform()
-
-            # Different data or different IP - check for conflicts with other platforms
-            for j, other_platform in enumerate(platforms):
-                if j != i:  # Skip the current platform being updated
-                    if other_platform.address == platform.address:
-                        raise HTTPException(status_code=400, detail=f"Platform with address '{platform.address}' already exists")
-                    if other_platform.public_credentials == platform.public_credentials:
-                        raise HTTPException(status_code=400, detail=f"Platform with public credential '{platform.public_credentials}' already exists")
-
-            # Update existing platform
-            platforms[i] = PlatformWithIP(
-                id=platform.id,
-                address=platform.address,
-                public_credentials=platform.public_credentials,
-                group=platform.group,
-                last_modified_ip=client_ip
-            )
-            _store_platforms(platforms)
-            response.status_code = 201
-            return platforms[i].to_platform()
-
-    # Check for duplicate address or credentials with existing platforms
-    if any(p.address == platform.address for p in platforms):
-        raise HTTPException(status_code=400, detail=f"Platform with address '{platform.address}' already exists")
+    async with lock.writer():
+        record, op = _register(platform, client_ip)
+        if op is not None:
+            _append_log(op, record)
 
-    if any(p.public_credentials == platform.public_credentials for p in platforms):
-        raise HTTPException(status_code=400, detail=f"Platform with public credential '{platform.public_credentials}' already exists")
+    return _json_response(record.to_dict(include_ip=False), status_code=200 if op is None else 201)
 
-    # Create new platform
-    new_platform = PlatformWithIP(
-        id=platform.id,
-        address=platform.address,
-        public_credentials=platform.public_credentials,
-        group=platform.group,
-        last_modified_ip=client_ip
-    )
-    platforms.append(new_platform)
-    _store_platforms(platforms)
-    response.status_code = 201
-    return new_platform.to_platform()
+@app.post("/platforms/bulk", response_model=List[Platform], status_code=201, tags=["Platforms"],
+          openapi_extra={"requestBody": {"content": {"application/json": {"schema": _platform_list_schema}},
+                                         "required": True}})
+async def register_platforms(request: Request):
+    """
+    Register several platforms at once
+
+    The request body is a JSON list of platforms.  Each platform is registered as
+    by POST /platform, in order.  If any platform conflicts none of them are
+    registered.
+
+    Parsing and validating the body runs in a thread pool so large payloads do
+    not hold up other requests.
+
+    Returns:
+    - 200: If the same IP resubmitted identical data for every platform
+    - 201: If any platform was created or updated
+    """
+    body = await request.body()
+    try:
+        platforms = await run_in_threadpool(_platform_list.validate_json, body)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False, include_context=False)])
+    client_ip = _get_client_ip(request)
+
+    async with lock.writer():
+        results, undo = [], []
+        try:
+            for platform in platforms:
+                previous = _state["by_id"].get(platform.id)
+                record, op = _register(platform, client_ip)
+                results.append((record, op))
+                if op is not None:
+                    undo.append((platform.id, previous))
+        except HTTPException:
+            # Restore the index to how it was before the request
+            for platform_id, previous in reversed(undo):
+                if previous is None:
+                    _remove_platform(platform_id)
+                else:
+                    _put_platform(previous)
+            raise
+
+        changed = False
+        for record, op in results:
+            if op is not None:
+                _append_log(op, record)
+                changed = True
+
+    return _json_response([record.to_dict(include_ip=False) for record, _ in results],
+                          status_code=201 if changed else 200)
 
 @app.get("/platform/{platform_id}", response_model=Platform, tags=["Platforms"])
-async def read_platform(platform_id: str, platforms: List[PlatformWithIP] = Depends(get_platforms)):
+async def read_platform(platform_id: str):
     """
     Get platform details by ID
 
     Retrieve detailed information about a specific platform
     """
-    for platform in platforms:
-        if platform.id == platform_id:
-            return platform.to_platform()
+    async with lock.reader():
+        platform = _state["by_id"].get(platform_id)
+    if platform is not None:
+        return _json_response(platform.to_dict(include_ip=False))
     raise HTTPException(status_code=404, detail=f"Platform with ID '{platform_id}' not found")
 
 @app.put("/platform/{platform_id}", response_model=Platform, tags=["Platforms"])
-async def update_platform(platform_id: str, updated_platform: Platform, request: Request, response: Response):
+async def update_platform(platform_id: str, updated_platform: Platform, request: Request):
     """
     Update platform information
 
@@ -234,45 +672,40 @@ async def update_platform(platform_id: str, updated_platform: Platform, request:
     - 200: If the same IP submits identical platform data
     - 201: If platform is updated with new data
     """
-    platforms = get_platforms()
     client_ip = _get_client_ip(request)
 
-    for i, platform in enumerate(platforms):
-        if platform.id == platform_id:
-            # Ensure ID doesn't change
-            if updated_platform.id != platform_id:
-                raise HTTPException(status_code=400, detail="Cannot change platform ID")
-
-            # Check if this is the same request from the same IP
-            if (platform.last_modified_ip == client_ip and
-                platform.address == updated_platform.address and
-                platform.public_credentials == updated_platform.public_credentials and
-                platform.group == updated_platform.group):
-                # Same data from same IP - return 200
-                response.status_code = 200
-                return Platform(**platform.dict(exclude={'last_modified_ip'}))
-
-            # Check for conflicts with other platforms (excluding current one)
-            for j, other_platform in enumerate(platforms):
-                if j != i:  # Skip the current platform being updated
-                    if other_platform.address == updated_platform.address:
-                        raise HTTPException(status_code=400, detail=f"Platform with address '{updated_platform.address}' already exists")
-                    if other_platform.public_credentials == updated_platform.public_credentials:
-                        raise HTTPException(status_code=400, detail=f"Platform with public credential '{updated_platform.public_credentials}' already exists")
-
-            # Update platform
-            platforms[i] = PlatformWithIP(
-                id=updated_platform.id,
-                address=updated_platform.address,
-                public_credentials=updated_platform.public_credentials,
-                group=updated_platform.group,
-                last_modified_ip=client_ip
-            )
-            _store_platforms(platforms)
-            response.status_code = 201
-            return Platform(**platforms[i].dict(exclude={'last_modified_ip'}))
+    async with lock.writer():
+        platform = _state["by_id"].get(platform_id)
+        if platform is None:
+            raise HTTPException(status_code=404, detail=f"Platform with ID '{platform_id}' not found")
+
+        # Ensure ID doesn't change
+        if updated_platform.id != platform_id:
+            raise HTTPException(status_code=400, detail="Cannot change platform ID")
+
+        # Check if this is the same request from the same IP
+        if (platform.last_modified_ip == client_ip and
+            platform.address == updated_platform.address and
+            platform.public_credentials == updated_platform.public_credentials and
+            platform.group == updated_platform.group):
+            # Same data from same IP - return 200
+            return _json_response(platform.to_dict(include_ip=False), status_code=200)
+
+        # Check for conflicts with other platforms (excluding current one)
+        _check_conflicts(updated_platform)
+
+        # Update platform
+        platform = PlatformWithIP(
+            id=updated_platform.id,
+            address=updated_platform.address,
+            public_credentials=updated_platform.public_credentials,
+            group=updated_platform.group,
+            last_modified_ip=client_ip
+        )
+        _put_platform(platform)
+        _append_log("update", platform)
 
-    raise HTTPException(status_code=404, detail=f"Platform with ID '{platform_id}' not found")
+    return _json_response(platform.to_dict(include_ip=False), status_code=201)
 
 @app.delete("/platform/{platform_id}", tags=["Platforms"])
 async def delete_platform(platform_id: str):
@@ -281,25 +714,47 @@ async def delete_platform(platform_id: str):
 
     Remove a platform from the system
     """
-    platforms = get_platforms()
-    initial_count = len(platforms)
-
-    platforms = [p for p in platforms if p.id != platform_id]
+    async with lock.writer():
+        platform = _remove_platform(platform_id)
+        if platform is None:
+            raise HTTPException(status_code=404, detail=f"Platform with ID '{platform_id}' not found")
+        _append_log("delete", platform)
 
-    if len(platforms) == initial_count:
-        raise HTTPException(status_code=404, detail=f"Platform with ID '{platform_id}' not found")
-
-    _store_platforms(platforms)
     return {"message": f"Platform '{platform_id}' deleted successfully"}
 
 @app.get("/platforms", response_model=List[Platform], tags=["Platforms"])
-async def list_platforms(platforms: List[PlatformWithIP] = Depends(get_platforms)):
+async def list_platforms():
     """
     List all platforms
 
     Get a list of all registered platforms
     """
-    return [p.to_platform() for p in platforms]
+    async with lock.reader():
+        if len(_state["by_id"]) > STREAM_THRESHOLD:
+            platforms = list(_state["by_id"].values())
+        else:
+            platforms = None
+            if _state["list_bytes"] is None:
+                _state["list_bytes"] = _json_dumps([p.to_dict(include_ip=False) for p in _state["by_id"].values()],
+                                                   indent=False)
+            content = _state["list_bytes"]
+
+    # Responses are returned directly, so the body is not revalidated against response_model
+    if platforms is None:
+        return Response(content=content, media_type="application/json")
+    return StreamingResponse(_stream_platforms(platforms), media_type="application/json")
+
+async def _stream_platforms(platforms):
+    """Yield platforms as a JSON list in chunks of STREAM_BATCH_SIZE
+
+    Nothing is kept once a chunk has been sent, so peak buffer memory is one batch
+    regardless of the number of platforms.
+    """
+    for i in range(0, len(platforms), STREAM_BATCH_SIZE):
+        batch = b",".join(_json_dumps(p.to_dict(include_ip=False), indent=False)
+                          for p in platforms[i:i + STREAM_BATCH_SIZE])
+        yield (b"," if i else b"[") + batch
+    yield b"]" if platforms else b"[]"
 
 def main():
      # Default port
@@ -313,6 +768,8 @@ def main():
             print("Invalid port number. Using default port 8000.")
 
     import uvicorn
+    # The platform index is held in process memory, so run uvicorn's default single
+    # worker; do not pass workers > 1.
     uvicorn.run("platform_lookup.app:app", host="0.0.0.0", port=port)
 
 if __name__ == "__main__":
@@ -0,0 +1,215 @@
+import asyncio
+import errno
+import os
+import shutil
+import threading
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+
+import platform_lookup.app as app_module
+from platform_lookup.app import app, lifespan
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """Run each test against its own platform files"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(app_module, "FLUSH_INTERVAL", 0.01)
+    return tmp_path
+
+
+@asynccontextmanager
+async def running():
+    """Start the app through its lifespan and yield a client talking to it over ASGI"""
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            yield client
+
+
+async def wait_for(condition, timeout=5):
+    """Poll condition until it is true, failing the test after timeout seconds"""
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    pytest.fail("timed out waiting for condition")
+
+
+def platform(platform_id, address, credentials=None, group="default"):
+    return {
+        "id": platform_id,
+        "address": address,
+        "public_credentials": credentials or platform_id.ljust(16, "0"),
+        "group": group
+    }
+
+
+@pytest.mark.anyio
+async def test_crash_during_compaction_keeps_index_consistent(data_dir, monkeypatch):
+    crash_dir = data_dir / "crash"
+    gate = threading.Event()
+    fsync_calls = []
+    real_fsync = os.fsync
+    real_store = app_module._store_platforms
+
+    def slow_fsync(fd):
+        # Hold up the first log append so later mutations queue behind it
+        fsync_calls.append(fd)
+        if len(fsync_calls) == 1:
+            gate.wait(5)
+        real_fsync(fd)
+
+    async def store_then_crash(platforms):
+        await real_store(platforms)
+        # Keep the files as a crash right after the snapshot is written would leave them
+        if not crash_dir.exists():
+            crash_dir.mkdir()
+            shutil.copy(app_module.platform_file, crash_dir)
+            shutil.copy(app_module.platform_log, crash_dir)
+
+    monkeypatch.setattr(os, "fsync", slow_fsync)
+    monkeypatch.setattr(app_module, "_store_platforms", store_then_crash)
+    monkeypatch.setattr(app_module, "COMPACT_MIN_SIZE", 0)
+
+    async with running() as client:
+        assert (await client.post("/platform", json=platform("p", "tcp://a"))).status_code == 201
+        await wait_for(lambda: fsync_calls)
+        assert (await client.put("/platform/p", json=platform("p", "tcp://b"))).status_code == 201
+        assert (await client.post("/platform", json=platform("q", "tcp://a"))).status_code == 201
+        gate.set()
+        await wait_for(crash_dir.exists)
+
+    monkeypatch.undo()
+    monkeypatch.chdir(crash_dir)
+    monkeypatch.setattr(app_module, "FLUSH_INTERVAL", 0.01)
+    async with running() as client:
+        listed = {p["id"]: p["address"] for p in (await client.get("/platforms")).json()}
+        assert listed == {"p": "tcp://b", "q": "tcp://a"}
+        assert app_module._state["by_addr"] == {"tcp://b": "p", "tcp://a": "q"}
+
+
+@pytest.mark.anyio
+async def test_failed_log_append_is_cut_off_before_retry(monkeypatch):
+    real_fsync = os.fsync
+    failures = []
+
+    def failing_fsync(fd):
+        # Leave part of the batch in the file and fail, as a full disk would
+        if not failures:
+            failures.append(fd)
+            os.ftruncate(fd, os.fstat(fd).st_size - 5)
+            raise OSError(errno.ENOSPC, "No space left on device")
+        real_fsync(fd)
+
+    async with running() as client:
+        assert (await client.post("/platform", json=platform("a", "tcp://a"))).status_code == 201
+        await wait_for(lambda: app_module._state["log_size"] > 0)
+        monkeypatch.setattr(os, "fsync", failing_fsync)
+        assert (await client.post("/platform", json=platform("b", "tcp://b"))).status_code == 201
+        await wait_for(lambda: failures and not app_module._state["pending"])
+
+    with open(app_module.platform_log, "rb") as f:
+        assert [app_module._json_loads(line)["platform"]["id"] for line in f] == ["a", "b"]
+    async with running() as client:
+        assert sorted(p["id"] for p in (await client.get("/platforms")).json()) == ["a", "b"]
+
+
+async def list_platforms(client):
+    return {p["id"]: p for p in (await client.get("/platforms")).json()}
+
+
+@pytest.mark.anyio
+async def test_restart_replays_log():
+    async with running() as client:
+        await client.post("/platform", json=platform("a", "tcp://a"))
+        await client.post("/platform", json=platform("b", "tcp://b"))
+        await client.put("/platform/a", json=platform("a", "tcp://a2", group="g"))
+        await client.delete("/platform/b")
+        expected = await list_platforms(client)
+
+    # Nothing was compacted, so the state only exists in the log
+    assert not os.path.exists(app_module.platform_file)
+    async with running() as client:
+        assert await list_platforms(client) == expected == {"a": platform("a", "tcp://a2", group="g")}
+
+
+@pytest.mark.anyio
+async def test_restart_discards_truncated_last_log_line():
+    async with running() as client:
+        await client.post("/platform", json=platform("a", "tcp://a"))
+    with open(app_module.platform_log, "ab") as f:
+        f.write(b'{"op":"add","platform":{"id":"b","addr')
+
+    async with running() as client:
+        assert list(await list_platforms(client)) == ["a"]
+        await client.post("/platform", json=platform("c", "tcp://c"))
+
+    async with running() as client:
+        assert sorted(await list_platforms(client)) == ["a", "c"]
+
+
+@pytest.mark.anyio
+async def test_compaction_then_restart(monkeypatch):
+    monkeypatch.setattr(app_module, "COMPACT_MIN_SIZE", 0)
+    async with running() as client:
+        for n in range(5):
+            await client.post("/platform", json=platform(f"p{n}", f"tcp://h:{n}"))
+        await client.put("/platform/p1", json=platform("p1", "tcp://h:0-moved"))
+        await client.put("/platform/p0", json=platform("p0", "tcp://h:1"))
+        await client.delete("/platform/p4")
+        expected = await list_platforms(client)
+
+    assert os.path.getsize(app_module.platform_log) == 0
+    async with running() as client:
+        assert await list_platforms(client) == expected
+        assert app_module._state["by_addr"] == {p["address"]: p["id"] for p in expected.values()}
+        assert app_module._state["by_cred"] == {p["public_credentials"]: p["id"] for p in expected.values()}
+
+
+@pytest.mark.anyio
+async def test_bulk_rolls_back_on_conflict_in_later_item():
+    async with running() as client:
+        await client.post("/platform", json=platform("a", "tcp://a"))
+        await client.post("/platform", json=platform("b", "tcp://b"))
+        await wait_for(lambda: not app_module._state["pending"])
+        before = await list_platforms(client)
+        with open(app_module.platform_log, "rb") as f:
+            log_before = f.read()
+
+        response = await client.post("/platforms/bulk", json=[
+            platform("c", "tcp://c"),
+            platform("a", "tcp://a", group="g"),
+            platform("d", "tcp://b")
+        ])
+        assert response.status_code == 400
+        assert await list_platforms(client) == before
+        assert app_module._state["by_addr"] == {"tcp://a": "a", "tcp://b": "b"}
+        assert not app_module._state["pending"]
+
+    with open(app_module.platform_log, "rb") as f:
+        assert f.read() == log_before
+
+
+@pytest.mark.anyio
+async def test_bulk_status_reflects_whether_anything_changed():
+    batch = [platform("a", "tcp://a"), platform("b", "tcp://b")]
+    async with running() as client:
+        response = await client.post("/platforms/bulk", json=batch)
+        assert response.status_code == 201
+        assert response.json() == batch
+
+        response = await client.post("/platforms/bulk", json=batch)
+        assert response.status_code == 200
+        assert response.json() == batch
+
+        batch[1]["group"] = "g"
+        assert (await client.post("/platforms/bulk", json=batch)).status_code == 201
+        assert (await client.post("/platforms/bulk", json=[])).status_code == 200